@@ -5,10 +5,14 @@ SQLite-backed HR platform: employees, departments, time tracking, PTO.
 
 import sqlite3
 import json
+import queue
+import threading
 import uuid
-from datetime import datetime, date, timedelta
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime, date, timedelta, timezone
 from dataclasses import dataclass, field, asdict
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Set, Tuple
 from enum import Enum
 from calendar import monthrange
 
@@ -35,120 +39,478 @@ class PTOStatus(str, Enum):
     DENIED = "denied"
 
 
+# Enums are stored as small integers. Code 0 (active / pending) is also
+# written literally in SQL so partial indexes on it can be matched.
+_EMPLOYEE_STATUS_CODES = {
+    EmployeeStatus.ACTIVE: 0,
+    EmployeeStatus.ON_LEAVE: 1,
+    EmployeeStatus.TERMINATED: 2,
+}
+_PTO_TYPE_CODES = {PTOType.VACATION: 0, PTOType.SICK: 1, PTOType.PERSONAL: 2}
+_PTO_STATUS_CODES = {PTOStatus.PENDING: 0, PTOStatus.APPROVED: 1, PTOStatus.DENIED: 2}
+
+_EMPLOYEE_STATUS_BY_CODE = {v: k for k, v in _EMPLOYEE_STATUS_CODES.items()}
+_PTO_TYPE_BY_CODE = {v: k for k, v in _PTO_TYPE_CODES.items()}
+_PTO_STATUS_BY_CODE = {v: k for k, v in _PTO_STATUS_CODES.items()}
+
+
 # ---------------------------------------------------------------------------
 # Dataclasses
 # ---------------------------------------------------------------------------
 
-@dataclass
+def _now_iso() -> str:
+    """Current UTC time as a naive ISO-8601 string, the ``created_at`` format."""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _format_id(value: Any) -> str:
+    """Display form of an id; tolerates str/None ids from older callers."""
+    return value.hex() if isinstance(value, bytes) else repr(value)
+
+
+def _new_id() -> bytes:
+    """Fresh row id: a random UUID stored as its 16 raw bytes (``.hex()`` to display)."""
+    return uuid.uuid4().bytes
+
+
+@dataclass(slots=True)
 class Department:
-    id: str
+    id: bytes
     name: str
-    head_id: Optional[str] = None
+    head_id: Optional[bytes] = None
     budget: float = 0.0
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = field(default_factory=_now_iso)
 
 
-@dataclass
+@dataclass(slots=True)
 class Employee:
-    id: str
+    id: bytes
     name: str
     email: str
     department: str
     title: str
-    manager_id: Optional[str]
+    manager_id: Optional[bytes]
     salary: float
     hire_date: str
     status: EmployeeStatus = EmployeeStatus.ACTIVE
     phone: str = ""
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = field(default_factory=_now_iso)
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeEntry:
-    id: str
-    employee_id: str
+    id: bytes
+    employee_id: bytes
     date: str
     hours: float
     project: str
     notes: str = ""
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = field(default_factory=_now_iso)
 
 
-@dataclass
+@dataclass(slots=True)
 class PTORequest:
-    id: str
-    employee_id: str
+    id: bytes
+    employee_id: bytes
     type: PTOType
     start_date: str
     end_date: str
     status: PTOStatus = PTOStatus.PENDING
     reason: str = ""
-    approved_by: Optional[str] = None
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    approved_by: Optional[bytes] = None
+    created_at: str = field(default_factory=_now_iso)
 
 
 # ---------------------------------------------------------------------------
 # Database layer
 # ---------------------------------------------------------------------------
 
+# Column lists fix the positional layout read by the _row_to_* helpers.
+_DEPARTMENT_COLUMNS = "id, name, head_id, budget, created_at"
+_EMPLOYEE_COLUMNS = (
+    "id, name, email, department, title, manager_id, salary, hire_date, status, phone, created_at"
+)
+_TIME_ENTRY_COLUMNS = "id, employee_id, date, hours, project, notes, created_at"
+_PTO_COLUMNS = (
+    "id, employee_id, type, start_date, end_date, status, reason, approved_by, created_at"
+)
+
+_SELECT_DEPARTMENT_SQL = f"SELECT {_DEPARTMENT_COLUMNS} FROM departments"
+_SELECT_EMPLOYEE_SQL = f"SELECT {_EMPLOYEE_COLUMNS} FROM employees"
+_SELECT_TIME_ENTRY_SQL = f"SELECT {_TIME_ENTRY_COLUMNS} FROM time_entries"
+_SELECT_PTO_SQL = f"SELECT {_PTO_COLUMNS} FROM pto_requests"
+
+_INSERT_DEPARTMENT_SQL = (
+    "INSERT INTO departments (id, name, budget, created_at) VALUES (?,?,?,?)"
+)
+
+# Used to auto-create departments; the UNIQUE name makes it a no-op if present.
+_ENSURE_DEPARTMENT_SQL = (
+    "INSERT OR IGNORE INTO departments (id, name, budget, created_at) VALUES (?,?,?,?)"
+)
+
+_INSERT_EMPLOYEE_SQL = """INSERT INTO employees
+    (id, name, email, department, title, manager_id, salary,
+     hire_date, status, phone, created_at)
+    VALUES (?,?,?,?,?,?,?,?,?,?,?)"""
+
+_INSERT_TIME_ENTRY_SQL = (
+    "INSERT INTO time_entries (id, employee_id, date, hours, project, notes, created_at) "
+    "VALUES (?,?,?,?,?,?,?)"
+)
+
+_INSERT_PTO_SQL = """INSERT INTO pto_requests
+    (id, employee_id, type, start_date, end_date, status, reason, created_at)
+    VALUES (?,?,?,?,?,?,?,?)"""
+
+_TRANSFER_SQL = (
+    f"UPDATE employees SET department = ?, title = ? WHERE id = ? RETURNING {_EMPLOYEE_COLUMNS}"
+)
+_UPDATE_SALARY_SQL = (
+    f"UPDATE employees SET salary = ? WHERE id = ? RETURNING {_EMPLOYEE_COLUMNS}"
+)
+_SET_EMPLOYEE_STATUS_SQL = (
+    f"UPDATE employees SET status = ? WHERE id = ? RETURNING {_EMPLOYEE_COLUMNS}"
+)
+_APPROVE_PTO_SQL = (
+    f"UPDATE pto_requests SET status = ?, approved_by = ? WHERE id = ? RETURNING {_PTO_COLUMNS}"
+)
+_DENY_PTO_SQL = (
+    f"UPDATE pto_requests SET status = ? WHERE id = ? RETURNING {_PTO_COLUMNS}"
+)
+
+# Whole days from the local calendar date, as date.today() would give;
+# unparseable hire dates yield NULL and report zero tenure. INDEXED BY pins
+# the partial hire_date index: without ANALYZE stats the planner would pick
+# the status index and sort in a temp b-tree instead.
+_TENURE_SQL = """SELECT name, department, title, hire_date,
+    COALESCE(ROUND(CAST(julianday('now', 'localtime', 'start of day')
+                        - julianday(hire_date) AS INTEGER) / 365.25, 1), 0)
+    FROM employees INDEXED BY idx_emp_hire
+    WHERE status = 0 ORDER BY hire_date ASC"""
+
+_CACHED_STATEMENTS = 256
+
+# Rows fetched per query by the iter_* methods
+_ITER_BATCH_SIZE = 500
+
+# Stamped into PRAGMA user_version. 0 means a database from before versioning:
+# TEXT UUID ids and TEXT enum values, which _init_schema converts.
+_SCHEMA_VERSION = 1
+
+_SCHEMA_TABLES = (
+    """CREATE TABLE departments (
+        id          BLOB PRIMARY KEY,
+        name        TEXT UNIQUE NOT NULL,
+        head_id     BLOB,
+        budget      REAL DEFAULT 0,
+        created_at  TEXT NOT NULL
+    )""",
+    """CREATE TABLE employees (
+        id          BLOB PRIMARY KEY,
+        name        TEXT NOT NULL,
+        email       TEXT UNIQUE NOT NULL,
+        department  TEXT NOT NULL,
+        title       TEXT NOT NULL,
+        manager_id  BLOB,
+        salary      REAL NOT NULL DEFAULT 0,
+        hire_date   TEXT NOT NULL,
+        status      INTEGER NOT NULL DEFAULT 0,
+        phone       TEXT DEFAULT '',
+        created_at  TEXT NOT NULL
+    )""",
+    """CREATE TABLE time_entries (
+        id          BLOB PRIMARY KEY,
+        employee_id BLOB NOT NULL REFERENCES employees(id),
+        date        TEXT NOT NULL,
+        hours       REAL NOT NULL,
+        project     TEXT NOT NULL,
+        notes       TEXT DEFAULT '',
+        created_at  TEXT NOT NULL
+    )""",
+    """CREATE TABLE pto_requests (
+        id          BLOB PRIMARY KEY,
+        employee_id BLOB NOT NULL REFERENCES employees(id),
+        type        INTEGER NOT NULL,
+        start_date  TEXT NOT NULL,
+        end_date    TEXT NOT NULL,
+        status      INTEGER NOT NULL DEFAULT 0,
+        reason      TEXT DEFAULT '',
+        approved_by BLOB,
+        created_at  TEXT NOT NULL
+    )""",
+)
+
+_SCHEMA_INDEXES = (
+    "CREATE INDEX idx_emp_dept ON employees(department)",
+    # Covers org_chart and list_employees_minimal, so both are index-only
+    """CREATE INDEX idx_emp_status_dept_cover
+        ON employees(status, department, id, name, title, manager_id)""",
+    "CREATE INDEX idx_emp_hire ON employees(hire_date) WHERE status = 0",
+    "CREATE INDEX idx_time_emp_date ON time_entries(employee_id, date DESC)",
+    "CREATE INDEX idx_pto_emp_status ON pto_requests(employee_id, status)",
+    "CREATE INDEX idx_pto_pending ON pto_requests(created_at) WHERE status = 0",
+)
+
+
+def _legacy_id(value: Any) -> Any:
+    """Convert a dashed UUID string id to its 16 bytes; blobs and NULL pass through."""
+    if value is None or isinstance(value, bytes):
+        return value
+    try:
+        return uuid.UUID(str(value)).bytes
+    except ValueError:
+        return str(value).encode()
+
+
+def _legacy_code(column: str, codes: Dict[Enum, int]) -> str:
+    """SQL expression mapping a legacy enum value (or its code) to the code.
+
+    Values outside ``codes`` map to NULL; ``_copy_legacy_rows`` rejects them.
+    """
+    whens = " ".join(f"WHEN {column} IN ('{member.value}', {code}, '{code}') THEN {code}"
+                     for member, code in codes.items())
+    return f"CASE WHEN {column} IS NULL THEN 0 {whens} END"
+
+_WRITER_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA foreign_keys=ON;
+"""
+
+_CONN_PRAGMAS = """
+    PRAGMA cache_size=-65536;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA busy_timeout=30000;
+"""
+
+
+# SQLite's historical default for SQLITE_MAX_VARIABLE_NUMBER; newer builds
+# allow more, but staying under it keeps every build happy.
+_MAX_SQL_PARAMETERS = 999
+
+
+class _BatchInserter:
+    """Multi-row ``INSERT ... VALUES (...), (...)`` kept under the parameter cap.
+
+    Rows are split into chunks of ``_MAX_SQL_PARAMETERS // len(columns)`` and
+    each chunk is one statement. Full chunks share the same SQL text, so they
+    hit the statement cache. Callers supply the surrounding transaction.
+    """
+
+    def __init__(self, table: str, columns: str, verb: str = "INSERT"):
+        width = len(columns.split(","))
+        self.query_prefix = f"{verb} INTO {table} ({columns}) VALUES "
+        self.placeholders = "(" + ",".join("?" * width) + ")"
+        self.max_rows = _MAX_SQL_PARAMETERS // width
+
+    def insert(self, conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        for start in range(0, len(rows), self.max_rows):
+            chunk = rows[start:start + self.max_rows]
+            conn.execute(
+                self.query_prefix + ",".join([self.placeholders] * len(chunk)),
+                [value for row in chunk for value in row],
+            )
+
+
+_DEPARTMENT_INSERTER = _BatchInserter(
+    "departments", "id, name, budget, created_at", verb="INSERT OR IGNORE"
+)
+_EMPLOYEE_INSERTER = _BatchInserter("employees", _EMPLOYEE_COLUMNS)
+_TIME_ENTRY_INSERTER = _BatchInserter("time_entries", _TIME_ENTRY_COLUMNS)
+_PTO_INSERTER = _BatchInserter(
+    "pto_requests", "id, employee_id, type, start_date, end_date, status, reason, created_at"
+)
+
+
 class HRDatabase:
-    def __init__(self, db_path: str = "hr.db"):
+    """Single writer connection plus a bounded pool of read-only connections.
+
+    Writes go through ``write()``, which serialises on a lock and opens the
+    transaction with ``BEGIN IMMEDIATE``. Reads go through ``read()``, which
+    checks out a read-only connection so WAL readers run alongside writes.
+    In-memory and temporary (``""``) databases cannot be shared across
+    connections, so there ``read()`` falls back to the writer.
+    """
+
+    def __init__(self, db_path: str = "hr.db", pool_size: int = 4,
+                 read_timeout: float = 30.0):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self._init_schema()
+        self.read_timeout = read_timeout
+        self._writer = sqlite3.connect(db_path, check_same_thread=False,
+                                       isolation_level=None,
+                                       cached_statements=_CACHED_STATEMENTS)
+        self._writer.row_factory = sqlite3.Row
+        self._writer.executescript(_WRITER_PRAGMAS + _CONN_PRAGMAS)
+        self._write_lock = threading.RLock()
+        self.conn = self._writer
+        try:
+            self._init_schema()
+        except BaseException:
+            self._writer.close()
+            raise
+
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        # ":memory:" and "" (SQLite's private temp database) exist only on
+        # the writer connection, so reads have to go through it
+        self._pool_size = 0 if db_path in (":memory:", "") else pool_size
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro" if self._pool_size else ""
+        for _ in range(self._pool_size):
+            reader = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                     cached_statements=_CACHED_STATEMENTS)
+            reader.row_factory = sqlite3.Row
+            reader.executescript(_CONN_PRAGMAS)
+            self._readers.put(reader)
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read-only connection for the duration of the block.
+
+        Raises TimeoutError if none is free within ``read_timeout`` seconds,
+        rather than waiting forever on a leaked checkout.
+        """
+        if not self._pool_size:
+            if not self._write_lock.acquire(timeout=self.read_timeout):
+                raise TimeoutError(
+                    f"writer connection for {self.db_path!r} not free within {self.read_timeout}s"
+                )
+            try:
+                yield self._writer
+            finally:
+                self._write_lock.release()
+            return
+        try:
+            conn = self._readers.get(timeout=self.read_timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"no read connection free within {self.read_timeout}s; "
+                f"all {self._pool_size} pooled readers are checked out"
+            ) from None
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Run the block as one write transaction on the writer connection.
+
+        The writer runs in autocommit mode and the transaction is opened
+        explicitly with ``BEGIN IMMEDIATE``, so the write lock is taken up
+        front (waiting up to ``busy_timeout``) instead of being upgraded
+        from a shared lock mid-transaction.
+        """
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+                # Inside the try: COMMIT itself can fail (e.g. deferred FKs)
+                self._writer.execute("COMMIT")
+            except BaseException:
+                # Some errors make SQLite roll back on its own
+                if self._writer.in_transaction:
+                    self._writer.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        self._writer.close()
 
     def _init_schema(self) -> None:
-        with self.conn:
-            self.conn.executescript("""
-                CREATE TABLE IF NOT EXISTS departments (
-                    id          TEXT PRIMARY KEY,
-                    name        TEXT UNIQUE NOT NULL,
-                    head_id     TEXT,
-                    budget      REAL DEFAULT 0,
-                    created_at  TEXT NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS employees (
-                    id          TEXT PRIMARY KEY,
-                    name        TEXT NOT NULL,
-                    email       TEXT UNIQUE NOT NULL,
-                    department  TEXT NOT NULL,
-                    title       TEXT NOT NULL,
-                    manager_id  TEXT,
-                    salary      REAL NOT NULL DEFAULT 0,
-                    hire_date   TEXT NOT NULL,
-                    status      TEXT DEFAULT 'active',
-                    phone       TEXT DEFAULT '',
-                    created_at  TEXT NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS time_entries (
-                    id          TEXT PRIMARY KEY,
-                    employee_id TEXT NOT NULL REFERENCES employees(id),
-                    date        TEXT NOT NULL,
-                    hours       REAL NOT NULL,
-                    project     TEXT NOT NULL,
-                    notes       TEXT DEFAULT '',
-                    created_at  TEXT NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS pto_requests (
-                    id          TEXT PRIMARY KEY,
-                    employee_id TEXT NOT NULL REFERENCES employees(id),
-                    type        TEXT NOT NULL,
-                    start_date  TEXT NOT NULL,
-                    end_date    TEXT NOT NULL,
-                    status      TEXT DEFAULT 'pending',
-                    reason      TEXT DEFAULT '',
-                    approved_by TEXT,
-                    created_at  TEXT NOT NULL
-                );
-
-                CREATE INDEX IF NOT EXISTS idx_emp_dept ON employees(department);
-                CREATE INDEX IF NOT EXISTS idx_time_emp ON time_entries(employee_id);
-                CREATE INDEX IF NOT EXISTS idx_pto_emp ON pto_requests(employee_id);
-            """)
+        """Create the schema, or upgrade a database stamped with an older version."""
+        version = self._writer.execute("PRAGMA user_version").fetchone()[0]
+        if version > _SCHEMA_VERSION:
+            raise RuntimeError(
+                f"{self.db_path} has schema version {version}, newer than the "
+                f"{_SCHEMA_VERSION} this hr_system supports"
+            )
+        if version == _SCHEMA_VERSION:
+            return
+        # Rebuilding tables copies rows in arbitrary order; check FKs afterwards
+        self._writer.execute("PRAGMA foreign_keys=OFF")
+        try:
+            with self.write() as c:
+                # Another process may have upgraded it while we waited for the lock
+                if c.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                    legacy = [r[0] for r in c.execute(
+                        "SELECT name FROM sqlite_master WHERE type = 'table' "
+                        "AND name IN ('departments', 'employees', 'time_entries', 'pto_requests')"
+                    )]
+                    for table in legacy:
+                        c.execute(f"ALTER TABLE {table} RENAME TO legacy_{table}")
+                    for stmt in _SCHEMA_TABLES:
+                        c.execute(stmt)
+                    if legacy:
+                        self._copy_legacy_rows(c, legacy)
+                        self._check_foreign_keys(c)
+                    for stmt in _SCHEMA_INDEXES:
+                        c.execute(stmt)
+                    c.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        finally:
+            self._writer.execute("PRAGMA foreign_keys=ON")
+
+    def _copy_legacy_rows(self, c: sqlite3.Connection, tables: List[str]) -> None:
+        """Move rows from pre-versioning tables (TEXT ids and enum values) into v1."""
+        enums = {
+            "employees": (("status", _EMPLOYEE_STATUS_CODES),),
+            "pto_requests": (("type", _PTO_TYPE_CODES), ("status", _PTO_STATUS_CODES)),
+        }
+        c.create_function("legacy_id", 1, _legacy_id, deterministic=True)
+        copies = {
+            "departments": """INSERT INTO departments (id, name, head_id, budget, created_at)
+                SELECT legacy_id(id), name, legacy_id(head_id), budget, created_at
+                FROM legacy_departments""",
+            "employees": f"""INSERT INTO employees ({_EMPLOYEE_COLUMNS})
+                SELECT legacy_id(id), name, email, department, title, legacy_id(manager_id),
+                       salary, hire_date, {_legacy_code("status", _EMPLOYEE_STATUS_CODES)},
+                       COALESCE(phone, ''), created_at
+                FROM legacy_employees""",
+            "time_entries": f"""INSERT INTO time_entries ({_TIME_ENTRY_COLUMNS})
+                SELECT legacy_id(id), legacy_id(employee_id), date, hours, project,
+                       COALESCE(notes, ''), created_at
+                FROM legacy_time_entries""",
+            "pto_requests": f"""INSERT INTO pto_requests ({_PTO_COLUMNS})
+                SELECT legacy_id(id), legacy_id(employee_id),
+                       {_legacy_code("type", _PTO_TYPE_CODES)}, start_date, end_date,
+                       {_legacy_code("status", _PTO_STATUS_CODES)}, COALESCE(reason, ''),
+                       legacy_id(approved_by), created_at
+                FROM legacy_pto_requests""",
+        }
+        for table in tables:
+            for column, codes in enums.get(table, ()):
+                bad = c.execute(
+                    f"SELECT {column} FROM legacy_{table} "
+                    f"WHERE ({_legacy_code(column, codes)}) IS NULL LIMIT 1"
+                ).fetchone()
+                if bad:
+                    raise RuntimeError(
+                        f"cannot upgrade {self.db_path} to schema version {_SCHEMA_VERSION}: "
+                        f"{table}.{column} holds {bad[0]!r}, which is not one of "
+                        f"{', '.join(repr(m.value) for m in codes)}"
+                    )
+            c.execute(copies[table])
+            c.execute(f"DROP TABLE legacy_{table}")
+
+    def _check_foreign_keys(self, c: sqlite3.Connection) -> None:
+        """Fail the migration, rolling it back, if any copied row is orphaned."""
+        violations = c.execute("PRAGMA foreign_key_check").fetchall()
+        if not violations:
+            return
+        orphans = []
+        for table, rowid, parent, _ in violations[:5]:
+            row_id = c.execute(f"SELECT id FROM {table} WHERE rowid = ?", (rowid,)).fetchone()[0]
+            orphans.append(f"{table} {_format_id(row_id)} -> missing {parent}")
+        more = f" (and {len(violations) - 5} more)" if len(violations) > 5 else ""
+        raise RuntimeError(
+            f"cannot upgrade {self.db_path} to schema version {_SCHEMA_VERSION}: "
+            f"{len(violations)} row(s) reference missing parents: "
+            + "; ".join(orphans) + more
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -158,8 +520,9 @@ class HRDatabase:
 class HRSystem:
     """Main HR service."""
 
-    def __init__(self, db_path: str = "hr.db"):
-        self.db = HRDatabase(db_path)
+    def __init__(self, db_path: str = "hr.db", pool_size: int = 4,
+                 read_timeout: float = 30.0):
+        self.db = HRDatabase(db_path, pool_size=pool_size, read_timeout=read_timeout)
         self.conn = self.db.conn
 
     # -----------------------------------------------------------------------
@@ -167,27 +530,23 @@ class HRSystem:
     # -----------------------------------------------------------------------
 
     def create_department(self, name: str, budget: float = 0.0) -> Department:
-        dept = Department(id=str(uuid.uuid4()), name=name, budget=budget)
-        with self.conn:
-            self.conn.execute(
-                "INSERT INTO departments (id, name, budget, created_at) VALUES (?,?,?,?)",
-                (dept.id, dept.name, dept.budget, dept.created_at),
-            )
+        dept = Department(id=_new_id(), name=name, budget=budget)
+        with self.db.write() as c:
+            c.execute(_INSERT_DEPARTMENT_SQL,
+                      (dept.id, dept.name, dept.budget, dept.created_at))
         return dept
 
     def get_department(self, name: str) -> Optional[Department]:
-        row = self.conn.execute(
-            "SELECT * FROM departments WHERE name = ?", (name,)
-        ).fetchone()
-        if not row:
-            return None
-        return Department(id=row["id"], name=row["name"], head_id=row["head_id"],
-                          budget=row["budget"], created_at=row["created_at"])
+        with self.db.read() as c:
+            row = c.execute(
+                _SELECT_DEPARTMENT_SQL + " WHERE name = ?", (name,)
+            ).fetchone()
+        return self._row_to_department(row) if row else None
 
     def list_departments(self) -> List[Department]:
-        rows = self.conn.execute("SELECT * FROM departments ORDER BY name").fetchall()
-        return [Department(id=r["id"], name=r["name"], head_id=r["head_id"],
-                           budget=r["budget"], created_at=r["created_at"]) for r in rows]
+        with self.db.read() as c:
+            rows = c.execute(_SELECT_DEPARTMENT_SQL + " ORDER BY name").fetchall()
+        return [self._row_to_department(r) for r in rows]
 
     # -----------------------------------------------------------------------
     # Employee operations
@@ -200,16 +559,13 @@ class HRSystem:
         department: str,
         title: str,
         salary: float,
-        manager_id: Optional[str] = None,
+        manager_id: Optional[bytes] = None,
         phone: str = "",
         hire_date: Optional[str] = None,
     ) -> Employee:
         """Onboard a new employee."""
-        # Auto-create department if missing
-        if not self.get_department(department):
-            self.create_department(department)
         emp = Employee(
-            id=str(uuid.uuid4()),
+            id=_new_id(),
             name=name,
             email=email,
             department=department,
@@ -219,28 +575,54 @@ class HRSystem:
             hire_date=hire_date or date.today().isoformat(),
             phone=phone,
         )
-        with self.conn:
-            self.conn.execute(
-                """INSERT INTO employees
-                   (id, name, email, department, title, manager_id, salary,
-                    hire_date, status, phone, created_at)
-                   VALUES (?,?,?,?,?,?,?,?,?,?,?)""",
-                (emp.id, emp.name, emp.email, emp.department, emp.title,
-                 emp.manager_id, emp.salary, emp.hire_date, emp.status.value,
-                 emp.phone, emp.created_at),
-            )
+        with self.db.write() as c:
+            # Auto-create department if missing
+            c.execute(_ENSURE_DEPARTMENT_SQL, self._new_department_params(department))
+            c.execute(_INSERT_EMPLOYEE_SQL, self._employee_params(emp))
         return emp
 
-    def get_employee(self, employee_id: str) -> Optional[Employee]:
-        row = self.conn.execute(
-            "SELECT * FROM employees WHERE id = ?", (employee_id,)
-        ).fetchone()
+    def hire_many(self, rows: List[Dict[str, Any]]) -> List[Employee]:
+        """Onboard many employees in a single transaction.
+
+        Each row takes the same keyword arguments as ``hire()``.
+        """
+        today = date.today().isoformat()
+        now = _now_iso()
+        employees = [
+            Employee(
+                id=_new_id(),
+                name=r["name"],
+                email=r["email"],
+                department=r["department"],
+                title=r["title"],
+                manager_id=r.get("manager_id"),
+                salary=r["salary"],
+                hire_date=r.get("hire_date") or today,
+                phone=r.get("phone", ""),
+                created_at=now,
+            )
+            for r in rows
+        ]
+        names = sorted({e.department for e in employees})
+        with self.db.write() as c:
+            _DEPARTMENT_INSERTER.insert(
+                c, [self._new_department_params(n, created_at=now) for n in names]
+            )
+            _EMPLOYEE_INSERTER.insert(c, [self._employee_params(e) for e in employees])
+        return employees
+
+    def get_employee(self, employee_id: bytes) -> Optional[Employee]:
+        with self.db.read() as c:
+            row = c.execute(
+                _SELECT_EMPLOYEE_SQL + " WHERE id = ?", (employee_id,)
+            ).fetchone()
         return self._row_to_employee(row) if row else None
 
     def get_employee_by_email(self, email: str) -> Optional[Employee]:
-        row = self.conn.execute(
-            "SELECT * FROM employees WHERE email = ?", (email,)
-        ).fetchone()
+        with self.db.read() as c:
+            row = c.execute(
+                _SELECT_EMPLOYEE_SQL + " WHERE email = ?", (email,)
+            ).fetchone()
         return self._row_to_employee(row) if row else None
 
     def list_employees(
@@ -248,67 +630,94 @@ class HRSystem:
         department: Optional[str] = None,
         status: Optional[EmployeeStatus] = None,
     ) -> List[Employee]:
-        query = "SELECT * FROM employees WHERE 1=1"
-        params: List[Any] = []
-        if department:
-            query += " AND department = ?"
-            params.append(department)
-        if status:
-            query += " AND status = ?"
-            params.append(status.value)
-        rows = self.conn.execute(query, params).fetchall()
+        where, params = self._employee_filter(department, status)
+        with self.db.read() as c:
+            rows = c.execute(_SELECT_EMPLOYEE_SQL + where, params).fetchall()
         return [self._row_to_employee(r) for r in rows]
 
-    def transfer(self, employee_id: str, new_department: str, new_title: str) -> Optional[Employee]:
+    def iter_employees(
+        self,
+        department: Optional[str] = None,
+        status: Optional[EmployeeStatus] = None,
+    ) -> Iterator[Employee]:
+        """Yield employees in batches instead of materialising a list.
+
+        Rows are read ``_ITER_BATCH_SIZE`` at a time (see ``_iter_pages``), so
+        a half-consumed iterator holds no pooled connection between batches.
+        Batches follow whichever index serves the filter, so each one is a
+        seek rather than a re-sort of every matching row.
+        """
+        where, params = self._employee_filter(department, status)
+        if status:
+            # idx_emp_status_dept_cover is ordered (status, department, id)
+            keys: Tuple[str, ...] = ("id",) if department else ("department", "id")
+        else:
+            keys = ("rowid",)  # the table itself, or idx_emp_dept's implicit suffix
+        query = f"SELECT {_EMPLOYEE_COLUMNS}, {', '.join(keys)} FROM employees" + where
+        for row in self._iter_pages(query, params, keys):
+            yield self._row_to_employee(row)
+
+    def list_employees_raw(
+        self,
+        department: Optional[str] = None,
+        status: Optional[EmployeeStatus] = None,
+    ) -> List[tuple]:
+        """Like ``list_employees`` but returns the stored rows as plain tuples.
+
+        Columns follow ``_EMPLOYEE_COLUMNS``, with ``status`` left as its
+        integer code. Meant for export and serialization paths that do not
+        need ``Employee`` objects.
+        """
+        where, params = self._employee_filter(department, status)
+        query = _SELECT_EMPLOYEE_SQL + where
+        with self.db.read() as c:
+            cur = c.cursor()
+            cur.row_factory = None
+            return cur.execute(query, params).fetchall()
+
+    def list_employees_minimal(
+        self,
+        department: str,
+        status: EmployeeStatus = EmployeeStatus.ACTIVE,
+    ) -> List[Tuple[bytes, str, str]]:
+        """Return ``(id, name, title)`` for a department, read from the index alone."""
+        with self.db.read() as c:
+            cur = c.cursor()
+            cur.row_factory = None
+            return cur.execute(
+                "SELECT id, name, title FROM employees WHERE status = ? AND department = ?",
+                (_EMPLOYEE_STATUS_CODES[status], department),
+            ).fetchall()
+
+    def transfer(self, employee_id: bytes, new_department: str, new_title: str) -> Optional[Employee]:
         """Transfer employee to a different department/role."""
-        if not self.get_employee(employee_id):
-            return None
-        if not self.get_department(new_department):
-            self.create_department(new_department)
-        with self.conn:
-            self.conn.execute(
-                "UPDATE employees SET department = ?, title = ? WHERE id = ?",
-                (new_department, new_title, employee_id),
-            )
-        return self.get_employee(employee_id)
+        with self.db.write() as c:
+            row = c.execute(
+                _TRANSFER_SQL, (new_department, new_title, employee_id)
+            ).fetchone()
+            if row:
+                c.execute(_ENSURE_DEPARTMENT_SQL,
+                          self._new_department_params(new_department))
+        return self._row_to_employee(row) if row else None
 
-    def terminate(self, employee_id: str, reason: str = "") -> Optional[Employee]:
+    def terminate(self, employee_id: bytes, reason: str = "") -> Optional[Employee]:
         """Terminate an employee."""
-        emp = self.get_employee(employee_id)
-        if not emp:
-            return None
-        with self.conn:
-            self.conn.execute(
-                "UPDATE employees SET status = 'terminated' WHERE id = ?",
-                (employee_id,),
-            )
-        return self.get_employee(employee_id)
-
-    def update_salary(self, employee_id: str, new_salary: float) -> Optional[Employee]:
-        if not self.get_employee(employee_id):
-            return None
-        with self.conn:
-            self.conn.execute(
-                "UPDATE employees SET salary = ? WHERE id = ?",
-                (new_salary, employee_id),
-            )
-        return self.get_employee(employee_id)
+        return self._update_employee(
+            _SET_EMPLOYEE_STATUS_SQL, (_EMPLOYEE_STATUS_CODES[EmployeeStatus.TERMINATED], employee_id)
+        )
 
-    def set_on_leave(self, employee_id: str) -> Optional[Employee]:
-        with self.conn:
-            self.conn.execute(
-                "UPDATE employees SET status = 'onleave' WHERE id = ?",
-                (employee_id,),
-            )
-        return self.get_employee(employee_id)
+    def update_salary(self, employee_id: bytes, new_salary: float) -> Optional[Employee]:
+        return self._update_employee(_UPDATE_SALARY_SQL, (new_salary, employee_id))
 
-    def return_from_leave(self, employee_id: str) -> Optional[Employee]:
-        with self.conn:
-            self.conn.execute(
-                "UPDATE employees SET status = 'active' WHERE id = ?",
-                (employee_id,),
-            )
-        return self.get_employee(employee_id)
+    def set_on_leave(self, employee_id: bytes) -> Optional[Employee]:
+        return self._update_employee(
+            _SET_EMPLOYEE_STATUS_SQL, (_EMPLOYEE_STATUS_CODES[EmployeeStatus.ON_LEAVE], employee_id)
+        )
+
+    def return_from_leave(self, employee_id: bytes) -> Optional[Employee]:
+        return self._update_employee(
+            _SET_EMPLOYEE_STATUS_SQL, (_EMPLOYEE_STATUS_CODES[EmployeeStatus.ACTIVE], employee_id)
+        )
 
     # -----------------------------------------------------------------------
     # Time tracking
@@ -316,58 +725,84 @@ class HRSystem:
 
     def log_time(
         self,
-        employee_id: str,
+        employee_id: bytes,
         hours: float,
         project: str,
         entry_date: Optional[str] = None,
         notes: str = "",
     ) -> TimeEntry:
-        if not self.get_employee(employee_id):
-            raise ValueError(f"Employee {employee_id} not found")
+        if not self._employee_exists(employee_id):
+            raise ValueError(f"Employee {_format_id(employee_id)} not found")
         if hours <= 0 or hours > 24:
             raise ValueError("Hours must be between 0 and 24")
         entry = TimeEntry(
-            id=str(uuid.uuid4()),
+            id=_new_id(),
             employee_id=employee_id,
             date=entry_date or date.today().isoformat(),
             hours=hours,
             project=project,
             notes=notes,
         )
-        with self.conn:
-            self.conn.execute(
-                "INSERT INTO time_entries (id, employee_id, date, hours, project, notes, created_at) VALUES (?,?,?,?,?,?,?)",
-                (entry.id, entry.employee_id, entry.date, entry.hours,
-                 entry.project, entry.notes, entry.created_at),
-            )
+        with self.db.write() as c:
+            c.execute(_INSERT_TIME_ENTRY_SQL, self._time_entry_params(entry))
         return entry
 
+    def log_time_many(self, rows: List[Dict[str, Any]]) -> List[TimeEntry]:
+        """Log many time entries in a single transaction.
+
+        Each row takes the same keyword arguments as ``log_time()``.
+        """
+        self._require_employees({r["employee_id"] for r in rows})
+        if any(r["hours"] <= 0 or r["hours"] > 24 for r in rows):
+            raise ValueError("Hours must be between 0 and 24")
+        today = date.today().isoformat()
+        now = _now_iso()
+        entries = [
+            TimeEntry(
+                id=_new_id(),
+                employee_id=r["employee_id"],
+                date=r.get("entry_date") or today,
+                hours=r["hours"],
+                project=r["project"],
+                notes=r.get("notes", ""),
+                created_at=now,
+            )
+            for r in rows
+        ]
+        with self.db.write() as c:
+            _TIME_ENTRY_INSERTER.insert(c, [self._time_entry_params(e) for e in entries])
+        return entries
+
     def get_time_entries(
         self,
-        employee_id: str,
+        employee_id: bytes,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
     ) -> List[TimeEntry]:
-        query = "SELECT * FROM time_entries WHERE employee_id = ?"
-        params: List[Any] = [employee_id]
-        if start_date:
-            query += " AND date >= ?"
-            params.append(start_date)
-        if end_date:
-            query += " AND date <= ?"
-            params.append(end_date)
-        query += " ORDER BY date DESC"
-        rows = self.conn.execute(query, params).fetchall()
-        return [TimeEntry(id=r["id"], employee_id=r["employee_id"], date=r["date"],
-                          hours=r["hours"], project=r["project"], notes=r["notes"],
-                          created_at=r["created_at"]) for r in rows]
-
-    def hours_by_project(self, employee_id: str) -> Dict[str, float]:
-        rows = self.conn.execute(
-            "SELECT project, SUM(hours) as total FROM time_entries WHERE employee_id = ? GROUP BY project",
+        query, params = self._time_entry_query(employee_id, start_date, end_date)
+        with self.db.read() as c:
+            rows = c.execute(query + " ORDER BY date DESC", params).fetchall()
+        return [self._row_to_time_entry(r) for r in rows]
+
+    def iter_time_entries(
+        self,
+        employee_id: bytes,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Iterator[TimeEntry]:
+        """Streaming form of ``get_time_entries``; see ``iter_employees``."""
+        query, params = self._time_entry_query(
+            employee_id, start_date, end_date, ", date, rowid"
+        )
+        # (date DESC, rowid) is exactly the order idx_time_emp_date stores
+        for row in self._iter_pages(query, params, ("date", "rowid"), descending=True):
+            yield self._row_to_time_entry(row)
+
+    def hours_by_project(self, employee_id: bytes) -> Dict[str, float]:
+        return self._fetch_dict(
+            "SELECT project, SUM(hours) FROM time_entries WHERE employee_id = ? GROUP BY project",
             (employee_id,),
-        ).fetchall()
-        return {r["project"]: r["total"] for r in rows}
+        )
 
     # -----------------------------------------------------------------------
     # PTO management
@@ -375,80 +810,94 @@ class HRSystem:
 
     def request_pto(
         self,
-        employee_id: str,
+        employee_id: bytes,
         pto_type: PTOType,
         start_date: str,
         end_date: str,
         reason: str = "",
     ) -> PTORequest:
-        if not self.get_employee(employee_id):
-            raise ValueError(f"Employee {employee_id} not found")
+        if not self._employee_exists(employee_id):
+            raise ValueError(f"Employee {_format_id(employee_id)} not found")
         req = PTORequest(
-            id=str(uuid.uuid4()),
+            id=_new_id(),
             employee_id=employee_id,
             type=pto_type,
             start_date=start_date,
             end_date=end_date,
             reason=reason,
         )
-        with self.conn:
-            self.conn.execute(
-                """INSERT INTO pto_requests
-                   (id, employee_id, type, start_date, end_date, status, reason, created_at)
-                   VALUES (?,?,?,?,?,?,?,?)""",
-                (req.id, req.employee_id, req.type.value, req.start_date,
-                 req.end_date, req.status.value, req.reason, req.created_at),
-            )
+        with self.db.write() as c:
+            c.execute(_INSERT_PTO_SQL, self._pto_params(req))
         return req
 
-    def approve_pto(self, pto_id: str, approver_id: Optional[str] = None) -> Optional[PTORequest]:
-        req = self.get_pto_request(pto_id)
-        if not req:
-            return None
-        with self.conn:
-            self.conn.execute(
-                "UPDATE pto_requests SET status = 'approved', approved_by = ? WHERE id = ?",
-                (approver_id, pto_id),
-            )
-        return self.get_pto_request(pto_id)
-
-    def deny_pto(self, pto_id: str) -> Optional[PTORequest]:
-        req = self.get_pto_request(pto_id)
-        if not req:
-            return None
-        with self.conn:
-            self.conn.execute(
-                "UPDATE pto_requests SET status = 'denied' WHERE id = ?", (pto_id,)
+    def request_pto_many(self, rows: List[Dict[str, Any]]) -> List[PTORequest]:
+        """File many PTO requests in a single transaction.
+
+        Each row takes the same keyword arguments as ``request_pto()``.
+        """
+        self._require_employees({r["employee_id"] for r in rows})
+        now = _now_iso()
+        requests = [
+            PTORequest(
+                id=_new_id(),
+                employee_id=r["employee_id"],
+                type=r["pto_type"],
+                start_date=r["start_date"],
+                end_date=r["end_date"],
+                reason=r.get("reason", ""),
+                created_at=now,
             )
-        return self.get_pto_request(pto_id)
-
-    def get_pto_request(self, pto_id: str) -> Optional[PTORequest]:
-        row = self.conn.execute(
-            "SELECT * FROM pto_requests WHERE id = ?", (pto_id,)
-        ).fetchone()
-        if not row:
-            return None
-        return PTORequest(id=row["id"], employee_id=row["employee_id"],
-                          type=PTOType(row["type"]), start_date=row["start_date"],
-                          end_date=row["end_date"], status=PTOStatus(row["status"]),
-                          reason=row["reason"], approved_by=row["approved_by"],
-                          created_at=row["created_at"])
+            for r in rows
+        ]
+        with self.db.write() as c:
+            _PTO_INSERTER.insert(c, [self._pto_params(r) for r in requests])
+        return requests
+
+    def approve_pto(self, pto_id: bytes, approver_id: Optional[bytes] = None) -> Optional[PTORequest]:
+        return self._update_pto(
+            _APPROVE_PTO_SQL, (_PTO_STATUS_CODES[PTOStatus.APPROVED], approver_id, pto_id)
+        )
+
+    def deny_pto(self, pto_id: bytes) -> Optional[PTORequest]:
+        return self._update_pto(
+            _DENY_PTO_SQL, (_PTO_STATUS_CODES[PTOStatus.DENIED], pto_id)
+        )
+
+    def get_pto_request(self, pto_id: bytes) -> Optional[PTORequest]:
+        with self.db.read() as c:
+            row = c.execute(
+                _SELECT_PTO_SQL + " WHERE id = ?", (pto_id,)
+            ).fetchone()
+        return self._row_to_pto(row) if row else None
 
     def list_pto_requests(
         self,
-        employee_id: Optional[str] = None,
+        employee_id: Optional[bytes] = None,
         status: Optional[PTOStatus] = None,
     ) -> List[PTORequest]:
-        query = "SELECT * FROM pto_requests WHERE 1=1"
-        params: List[Any] = []
-        if employee_id:
-            query += " AND employee_id = ?"
-            params.append(employee_id)
-        if status:
-            query += " AND status = ?"
-            params.append(status.value)
-        rows = self.conn.execute(query, params).fetchall()
-        return [self.get_pto_request(r["id"]) for r in rows]
+        query, params = self._pto_query(employee_id, status)
+        with self.db.read() as c:
+            rows = c.execute(query + " ORDER BY created_at", params).fetchall()
+        return [self._row_to_pto(r) for r in rows]
+
+    def iter_pto_requests(
+        self,
+        employee_id: Optional[bytes] = None,
+        status: Optional[PTOStatus] = None,
+    ) -> Iterator[PTORequest]:
+        """Streaming form of ``list_pto_requests``; see ``iter_employees``.
+
+        Only pending requests across all employees have an index in
+        ``created_at`` order (idx_pto_pending), so only they are paged; any
+        other filter is read with a single sorted query instead of re-sorting
+        the table once per batch.
+        """
+        if employee_id or status != PTOStatus.PENDING:
+            yield from self.list_pto_requests(employee_id, status)
+            return
+        query, params = self._pto_query(employee_id, status, ", created_at, rowid")
+        for row in self._iter_pages(query, params, ("created_at", "rowid")):
+            yield self._row_to_pto(row)
 
     # -----------------------------------------------------------------------
     # Analytics
@@ -456,94 +905,256 @@ class HRSystem:
 
     def payroll_summary(self, month: Optional[str] = None) -> Dict[str, Any]:
         """Monthly payroll breakdown by department."""
-        rows = self.conn.execute(
-            """SELECT department, COUNT(*) as headcount, SUM(salary) as total_salary
-               FROM employees WHERE status = 'active' GROUP BY department"""
-        ).fetchall()
-        departments = {}
-        total_payroll = 0.0
-        total_headcount = 0
-        for r in rows:
-            monthly = r["total_salary"] / 12
-            departments[r["department"]] = {
-                "headcount": r["headcount"],
-                "annual_salary": round(r["total_salary"], 2),
-                "monthly_payroll": round(monthly, 2),
-            }
-            total_payroll += monthly
-            total_headcount += r["headcount"]
+        with self.db.read() as c:
+            rows = c.execute(
+                """SELECT department,
+                          COUNT(*) AS headcount,
+                          ROUND(SUM(salary), 2) AS annual_salary,
+                          ROUND(SUM(salary) / 12.0, 2) AS monthly_payroll,
+                          SUM(COUNT(*)) OVER () AS total_headcount,
+                          ROUND(SUM(SUM(salary)) OVER () / 12.0, 2) AS total_monthly_payroll
+                   FROM employees WHERE status = 0 GROUP BY department"""
+            ).fetchall()
         return {
             "month": month or date.today().strftime("%Y-%m"),
-            "total_headcount": total_headcount,
-            "total_monthly_payroll": round(total_payroll, 2),
-            "by_department": departments,
+            "total_headcount": rows[0]["total_headcount"] if rows else 0,
+            "total_monthly_payroll": rows[0]["total_monthly_payroll"] if rows else 0.0,
+            "by_department": {
+                r["department"]: {
+                    "headcount": r["headcount"],
+                    "annual_salary": r["annual_salary"],
+                    "monthly_payroll": r["monthly_payroll"],
+                }
+                for r in rows
+            },
         }
 
     def org_chart(self) -> Dict[str, Any]:
         """Return hierarchical org chart as nested dict."""
-        employees = self.list_employees(status=EmployeeStatus.ACTIVE)
-        emp_map = {e.id: {"id": e.id, "name": e.name, "title": e.title,
-                          "department": e.department, "reports": []}
-                   for e in employees}
+        emp_map: Dict[bytes, Dict[str, Any]] = {}
+        links = []  # (node, manager_id); managers may appear later in the scan
+        with self.db.read() as c:
+            for r in c.execute(
+                "SELECT id, name, title, department, manager_id FROM employees WHERE status = 0"
+            ):
+                node = {"id": r[0], "name": r[1], "title": r[2],
+                        "department": r[3], "reports": []}
+                emp_map[r[0]] = node
+                links.append((node, r[4]))
         roots = []
-        for e in employees:
-            if e.manager_id and e.manager_id in emp_map:
-                emp_map[e.manager_id]["reports"].append(emp_map[e.id])
+        for node, manager_id in links:
+            manager = emp_map.get(manager_id) if manager_id else None
+            if manager is not None:
+                manager["reports"].append(node)
             else:
-                roots.append(emp_map[e.id])
+                roots.append(node)
         return {"org": roots}
 
     def headcount_by_department(self) -> Dict[str, int]:
-        rows = self.conn.execute(
-            "SELECT department, COUNT(*) as count FROM employees WHERE status='active' GROUP BY department"
-        ).fetchall()
-        return {r["department"]: r["count"] for r in rows}
+        return self._fetch_dict(
+            "SELECT department, COUNT(*) FROM employees WHERE status = 0 GROUP BY department"
+        )
 
     def tenure_report(self) -> List[Dict[str, Any]]:
         """Return employees sorted by tenure (longest first)."""
-        today = date.today().isoformat()
-        rows = self.conn.execute(
-            "SELECT id, name, department, title, hire_date FROM employees WHERE status='active' ORDER BY hire_date ASC"
-        ).fetchall()
-        result = []
-        for r in rows:
-            try:
-                hire = date.fromisoformat(r["hire_date"])
-                days = (date.today() - hire).days
-                years = round(days / 365.25, 1)
-            except Exception:
-                days = 0
-                years = 0
-            result.append({
-                "name": r["name"],
-                "department": r["department"],
-                "title": r["title"],
-                "hire_date": r["hire_date"],
-                "tenure_years": years,
-            })
-        return result
+        with self.db.read() as c:
+            rows = c.execute(_TENURE_SQL).fetchall()
+        return [{"name": r[0], "department": r[1], "title": r[2],
+                 "hire_date": r[3], "tenure_years": r[4]} for r in rows]
 
     # -----------------------------------------------------------------------
     # Helpers
     # -----------------------------------------------------------------------
 
+    def _employee_exists(self, employee_id: bytes) -> bool:
+        with self.db.read() as c:
+            return c.execute(
+                "SELECT 1 FROM employees WHERE id = ? LIMIT 1", (employee_id,)
+            ).fetchone() is not None
+
+    def _require_employees(self, employee_ids: Set[bytes]) -> None:
+        ids = list(employee_ids)
+        found: Set[bytes] = set()
+        with self.db.read() as c:
+            for start in range(0, len(ids), _MAX_SQL_PARAMETERS):
+                chunk = ids[start:start + _MAX_SQL_PARAMETERS]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(r[0] for r in c.execute(
+                    f"SELECT id FROM employees WHERE id IN ({placeholders})", chunk
+                ))
+        for employee_id in ids:
+            if employee_id not in found:
+                raise ValueError(f"Employee {_format_id(employee_id)} not found")
+
+    def _employee_filter(
+        self, department: Optional[str], status: Optional[EmployeeStatus]
+    ) -> Tuple[str, List[Any]]:
+        where = " WHERE 1=1"
+        params: List[Any] = []
+        if department:
+            where += " AND department = ?"
+            params.append(department)
+        if status:
+            where += " AND status = ?"
+            params.append(_EMPLOYEE_STATUS_CODES[status])
+        return where, params
+
+    @staticmethod
+    def _time_entry_query(
+        employee_id: bytes,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        extra_columns: str = "",
+    ) -> Tuple[str, List[Any]]:
+        query = f"SELECT {_TIME_ENTRY_COLUMNS}{extra_columns} FROM time_entries WHERE employee_id = ?"
+        params: List[Any] = [employee_id]
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+        return query, params
+
+    @staticmethod
+    def _pto_query(
+        employee_id: Optional[bytes],
+        status: Optional[PTOStatus],
+        extra_columns: str = "",
+    ) -> Tuple[str, List[Any]]:
+        query = f"SELECT {_PTO_COLUMNS}{extra_columns} FROM pto_requests WHERE 1=1"
+        params: List[Any] = []
+        if employee_id:
+            query += " AND employee_id = ?"
+            params.append(employee_id)
+        if status:
+            # Inlined rather than bound so the planner can match the
+            # idx_pto_pending partial index; the code comes from our own map.
+            query += f" AND status = {_PTO_STATUS_CODES[status]}"
+        return query, params
+
+    def _iter_pages(
+        self,
+        sql: str,
+        params: List[Any],
+        keys: Tuple[str, ...],
+        descending: bool = False,
+    ) -> Iterator[sqlite3.Row]:
+        """Yield the rows of ``sql`` ordered by ``keys``, one batch per query.
+
+        ``sql`` must end in a WHERE clause and select the key columns last,
+        and an index must serve ``keys`` for the filter, or every batch
+        re-sorts all matching rows. ``descending`` flips the leading key only;
+        the rest stay ascending, matching a ``DESC`` index column followed by
+        its implicit rowid.
+        Each batch is a fresh keyset query resuming after the previous batch's
+        last key, so the read connection goes back to the pool (and no WAL
+        snapshot stays pinned) while the caller works through a batch. Rows
+        committed mid-iteration may therefore show up in later batches.
+        """
+        lead, rest = keys[0], keys[1:]
+        if descending:
+            order = ", ".join((f"{lead} DESC",) + rest)
+            # The leading bound is what lets the index seek to the resume point
+            resume = (f" AND {lead} <= ? AND ({lead} < ? OR "
+                      f"({', '.join(rest)}) > ({', '.join('?' * len(rest))}))"
+                      if rest else f" AND {lead} < ?")
+        else:
+            order = ", ".join(keys)
+            resume = f" AND ({order}) > ({', '.join('?' * len(keys))})"
+        after: Optional[List[Any]] = None
+        while True:
+            page_sql, page_params = sql, list(params)
+            if after is not None:
+                page_sql += resume
+                page_params += after[:1] + after if descending and rest else after
+            page_sql += f" ORDER BY {order} LIMIT {_ITER_BATCH_SIZE}"
+            with self.db.read() as c:
+                rows = c.execute(page_sql, page_params).fetchall()
+            yield from rows
+            if len(rows) < _ITER_BATCH_SIZE:
+                return
+            after = list(rows[-1][-len(keys):])
+
+    def _fetch_dict(self, sql: str, params: tuple = ()) -> Dict[Any, Any]:
+        """Run a two-column query and return it as ``{first: second}``."""
+        with self.db.read() as c:
+            cur = c.cursor()
+            cur.row_factory = None  # plain tuples, so dict() consumes them in C
+            return dict(cur.execute(sql, params))
+
+    def _update_employee(self, sql: str, params: tuple) -> Optional[Employee]:
+        """Run an ``UPDATE ... RETURNING`` and map the row, or None if no match."""
+        with self.db.write() as c:
+            row = c.execute(sql, params).fetchone()
+        return self._row_to_employee(row) if row else None
+
+    def _update_pto(self, sql: str, params: tuple) -> Optional[PTORequest]:
+        with self.db.write() as c:
+            row = c.execute(sql, params).fetchone()
+        return self._row_to_pto(row) if row else None
+
+    @staticmethod
+    def _new_department_params(name: str, created_at: Optional[str] = None) -> tuple:
+        dept = Department(id=_new_id(), name=name, created_at=created_at or _now_iso())
+        return (dept.id, dept.name, dept.budget, dept.created_at)
+
+    @staticmethod
+    def _employee_params(emp: Employee) -> tuple:
+        return (emp.id, emp.name, emp.email, emp.department, emp.title,
+                emp.manager_id, emp.salary, emp.hire_date, _EMPLOYEE_STATUS_CODES[emp.status],
+                emp.phone, emp.created_at)
+
+    @staticmethod
+    def _time_entry_params(entry: TimeEntry) -> tuple:
+        return (entry.id, entry.employee_id, entry.date, entry.hours,
+                entry.project, entry.notes, entry.created_at)
+
+    @staticmethod
+    def _pto_params(req: PTORequest) -> tuple:
+        return (req.id, req.employee_id, _PTO_TYPE_CODES[req.type], req.start_date,
+                req.end_date, _PTO_STATUS_CODES[req.status], req.reason, req.created_at)
+
+    # Positional access; column order is fixed by the *_COLUMNS constants.
+
+    def _row_to_department(self, row: sqlite3.Row) -> Department:
+        return Department(id=row[0], name=row[1], head_id=row[2],
+                          budget=row[3], created_at=row[4])
+
     def _row_to_employee(self, row: sqlite3.Row) -> Employee:
         return Employee(
-            id=row["id"],
-            name=row["name"],
-            email=row["email"],
-            department=row["department"],
-            title=row["title"],
-            manager_id=row["manager_id"],
-            salary=row["salary"],
-            hire_date=row["hire_date"],
-            status=EmployeeStatus(row["status"]),
-            phone=row["phone"],
-            created_at=row["created_at"],
+            id=row[0],
+            name=row[1],
+            email=row[2],
+            department=row[3],
+            title=row[4],
+            manager_id=row[5],
+            salary=row[6],
+            hire_date=row[7],
+            status=_EMPLOYEE_STATUS_BY_CODE[row[8]],
+            phone=row[9],
+            created_at=row[10],
+        )
+
+    def _row_to_time_entry(self, row: sqlite3.Row) -> TimeEntry:
+        return TimeEntry(id=row[0], employee_id=row[1], date=row[2], hours=row[3],
+                         project=row[4], notes=row[5], created_at=row[6])
+
+    def _row_to_pto(self, row: sqlite3.Row) -> PTORequest:
+        return PTORequest(
+            id=row[0],
+            employee_id=row[1],
+            type=_PTO_TYPE_BY_CODE[row[2]],
+            start_date=row[3],
+            end_date=row[4],
+            status=_PTO_STATUS_BY_CODE[row[5]],
+            reason=row[6],
+            approved_by=row[7],
+            created_at=row[8],
         )
 
     def close(self) -> None:
-        self.conn.close()
+        self.db.close()
 
 
 # ---------------------------------------------------------------------------
@@ -563,6 +1174,7 @@ def demo() -> None:
     bob = hr.hire("Bob Martinez", "bob@co.com", "Engineering", "Engineer", 120_000, manager_id=alice.id)
     carol = hr.hire("Carol Lee", "carol@co.com", "Sales", "Account Executive", 90_000)
     print(f"  Hired: {alice.name}, {bob.name}, {carol.name}")
+    print(f"  Alice's employee id: {alice.id.hex()}")
 
     print("\n=== Transfer & Promotion ===")
     hr.transfer(carol.id, "Sales", "Senior Account Executive")
@@ -1,7 +1,30 @@
 """pytest tests for BlackRoad HR System"""
+import sqlite3
+import uuid
 import pytest
 from hr_system import HRSystem, EmployeeStatus, PTOType, PTOStatus
 
+# Schema written by releases before PRAGMA user_version was stamped
+LEGACY_SCHEMA = """
+CREATE TABLE departments (id TEXT PRIMARY KEY, name TEXT UNIQUE NOT NULL, head_id TEXT,
+                          budget REAL DEFAULT 0, created_at TEXT NOT NULL);
+CREATE TABLE employees (id TEXT PRIMARY KEY, name TEXT NOT NULL, email TEXT UNIQUE NOT NULL,
+                        department TEXT NOT NULL, title TEXT NOT NULL, manager_id TEXT,
+                        salary REAL NOT NULL DEFAULT 0, hire_date TEXT NOT NULL,
+                        status TEXT DEFAULT 'active', phone TEXT DEFAULT '',
+                        created_at TEXT NOT NULL);
+CREATE TABLE time_entries (id TEXT PRIMARY KEY, employee_id TEXT NOT NULL REFERENCES employees(id),
+                           date TEXT NOT NULL, hours REAL NOT NULL, project TEXT NOT NULL,
+                           notes TEXT DEFAULT '', created_at TEXT NOT NULL);
+CREATE TABLE pto_requests (id TEXT PRIMARY KEY, employee_id TEXT NOT NULL REFERENCES employees(id),
+                           type TEXT NOT NULL, start_date TEXT NOT NULL, end_date TEXT NOT NULL,
+                           status TEXT DEFAULT 'pending', reason TEXT DEFAULT '',
+                           approved_by TEXT, created_at TEXT NOT NULL);
+CREATE INDEX idx_emp_dept ON employees(department);
+CREATE INDEX idx_time_emp ON time_entries(employee_id);
+CREATE INDEX idx_pto_emp ON pto_requests(employee_id);
+"""
+
 
 @pytest.fixture
 def hr(tmp_path):
@@ -63,18 +86,433 @@ def test_deny_pto(hr):
 def test_payroll_summary(hr):
     hr.hire("Jack", "jack@test.com", "Finance", "CFO", 200_000)
     hr.hire("Jill", "jill@test.com", "Finance", "Analyst", 80_000)
+    hr.hire("Jo", "jo@test.com", "Eng", "Dev", 120_000)
     summary = hr.payroll_summary()
-    assert summary["total_headcount"] == 2
-    assert summary["total_monthly_payroll"] > 0
+    assert summary["total_headcount"] == 3
+    assert summary["total_monthly_payroll"] == 33_333.33
+    assert summary["by_department"]["Finance"] == {
+        "headcount": 2, "annual_salary": 280_000, "monthly_payroll": 23_333.33,
+    }
+
+def test_payroll_summary_empty(hr):
+    summary = hr.payroll_summary("2025-01")
+    assert summary["total_headcount"] == 0
+    assert summary["by_department"] == {}
 
 def test_org_chart(hr):
     mgr = hr.hire("Manager", "mgr@test.com", "Eng", "VP", 180_000)
     hr.hire("Report1", "r1@test.com", "Eng", "Dev", 100_000, manager_id=mgr.id)
     chart = hr.org_chart()
     assert len(chart["org"]) >= 1
+    assert [r["name"] for r in chart["org"][0]["reports"]] == ["Report1"]
 
 def test_list_by_department(hr):
     hr.hire("K", "k@test.com", "Sales", "AE", 70_000)
     hr.hire("L", "l@test.com", "Eng", "Dev", 100_000)
     sales = hr.list_employees(department="Sales")
     assert len(sales) == 1
+
+def test_wal_mode_enabled(hr):
+    mode = hr.conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+def test_reads_use_pool_during_write(hr):
+    e = hr.hire("Pool", "pool@test.com", "Eng", "Dev", 100_000)
+    with hr.db.write() as c:
+        c.execute("UPDATE employees SET title = 'Lead' WHERE id = ?", (e.id,))
+        # Readers see the last committed state while the write is open
+        assert hr.get_employee(e.id).title == "Dev"
+    assert hr.get_employee(e.id).title == "Lead"
+
+@pytest.mark.parametrize("path", [":memory:", ""])
+def test_private_database(path):
+    h = HRSystem(path)
+    e = h.hire("Mem", "mem@test.com", "Eng", "Dev", 100_000)
+    assert h.get_employee(e.id).name == "Mem"
+    h.close()
+
+def test_hire_many(hr):
+    hr.create_department("Eng")
+    emps = hr.hire_many([
+        {"name": "M1", "email": "m1@test.com", "department": "Eng", "title": "Dev", "salary": 100_000},
+        {"name": "M2", "email": "m2@test.com", "department": "Ops", "title": "SRE", "salary": 110_000},
+    ])
+    assert len(emps) == 2
+    assert hr.get_employee(emps[1].id).department == "Ops"
+    assert hr.get_department("Ops") is not None
+    assert len(hr.list_departments()) == 2
+
+def test_log_time_and_pto_many(hr):
+    e = hr.hire("Bulk", "bulk@test.com", "Eng", "Dev", 100_000)
+    hr.log_time_many([
+        {"employee_id": e.id, "hours": 4, "project": "A"},
+        {"employee_id": e.id, "hours": 3, "project": "A"},
+        {"employee_id": e.id, "hours": 2, "project": "B"},
+    ])
+    assert hr.hours_by_project(e.id) == {"A": 7, "B": 2}
+    reqs = hr.request_pto_many([
+        {"employee_id": e.id, "pto_type": PTOType.SICK, "start_date": "2025-01-02", "end_date": "2025-01-02"},
+    ])
+    assert hr.get_pto_request(reqs[0].id).type == PTOType.SICK
+
+def test_log_time_many_unknown_employee_writes_nothing(hr):
+    e = hr.hire("Solo", "solo@test.com", "Eng", "Dev", 100_000)
+    with pytest.raises(ValueError):
+        hr.log_time_many([
+            {"employee_id": e.id, "hours": 4, "project": "A"},
+            {"employee_id": "missing", "hours": 4, "project": "A"},
+        ])
+    assert hr.get_time_entries(e.id) == []
+
+def test_list_pto_requests(hr):
+    e = hr.hire("Lena", "lena@test.com", "HR", "Staff", 60_000)
+    a = hr.request_pto(e.id, PTOType.VACATION, "2025-09-01", "2025-09-05")
+    hr.request_pto(e.id, PTOType.PERSONAL, "2025-10-01", "2025-10-01")
+    hr.approve_pto(a.id)
+    assert len(hr.list_pto_requests(employee_id=e.id)) == 2
+    pending = hr.list_pto_requests(status=PTOStatus.PENDING)
+    assert [r.type for r in pending] == [PTOType.PERSONAL]
+
+def test_mutators_return_none_for_unknown_employee(hr):
+    assert hr.update_salary("missing", 1) is None
+    assert hr.terminate("missing") is None
+    assert hr.set_on_leave("missing") is None
+    assert hr.transfer("missing", "Ghost", "Nobody") is None
+    assert hr.get_department("Ghost") is None
+
+def test_leave_round_trip(hr):
+    e = hr.hire("Mona", "mona@test.com", "Eng", "Dev", 100_000)
+    assert hr.set_on_leave(e.id).status == EmployeeStatus.ON_LEAVE
+    assert hr.return_from_leave(e.id).status == EmployeeStatus.ACTIVE
+
+def test_get_time_entries_range(hr):
+    e = hr.hire("Nina", "nina@test.com", "Eng", "Dev", 100_000)
+    for d in ("2025-03-01", "2025-03-03", "2025-03-02", "2025-04-01"):
+        hr.log_time(e.id, 1, "P", entry_date=d)
+    entries = hr.get_time_entries(e.id, start_date="2025-03-01", end_date="2025-03-31")
+    assert [t.date for t in entries] == ["2025-03-03", "2025-03-02", "2025-03-01"]
+
+def test_status_stored_as_integer(hr):
+    e = hr.hire("Omar", "omar@test.com", "Eng", "Dev", 100_000)
+    hr.hire("Pia", "pia@test.com", "Eng", "Dev", 100_000)
+    hr.terminate(e.id)
+    stored = hr.conn.execute("SELECT status FROM employees WHERE id = ?", (e.id,)).fetchone()[0]
+    assert stored == 2
+    terminated = hr.list_employees(status=EmployeeStatus.TERMINATED)
+    assert [t.name for t in terminated] == ["Omar"]
+    assert hr.headcount_by_department() == {"Eng": 1}
+
+def test_tenure_report(hr):
+    from datetime import date, timedelta
+    ten_years_ago = (date.today() - timedelta(days=3653)).isoformat()
+    hr.hire("Quinn", "quinn@test.com", "Eng", "Dev", 100_000)
+    hr.hire("Rosa", "rosa@test.com", "Eng", "Dev", 100_000, hire_date=ten_years_ago)
+    report = hr.tenure_report()
+    assert [r["name"] for r in report] == ["Rosa", "Quinn"]
+    assert report[0]["tenure_years"] == 10.0
+    assert report[1]["tenure_years"] == 0
+
+def test_ids_are_16_byte_uuids(hr):
+    e = hr.hire("Sam", "sam@test.com", "Eng", "Dev", 100_000)
+    entry = hr.log_time(e.id, 1, "P")
+    assert isinstance(e.id, bytes) and len(e.id) == 16
+    assert hr.get_time_entries(e.id)[0].id == entry.id
+    assert len(e.id.hex()) == 32
+
+def test_pto_decisions(hr):
+    mgr = hr.hire("Tara", "tara@test.com", "HR", "Manager", 90_000)
+    e = hr.hire("Uma", "uma@test.com", "HR", "Staff", 60_000)
+    req = hr.request_pto(e.id, PTOType.VACATION, "2025-11-01", "2025-11-03")
+    approved = hr.approve_pto(req.id, approver_id=mgr.id)
+    assert approved.approved_by == mgr.id
+    assert hr.get_pto_request(req.id) == approved
+    assert hr.approve_pto("missing") is None
+    assert hr.deny_pto("missing") is None
+
+def test_bulk_insert_spans_parameter_chunks(hr):
+    # 999 params cap: 11 employee columns -> 90 rows per INSERT, 7 time-entry
+    # columns -> 142 rows per INSERT
+    statements = []
+    hr.conn.set_trace_callback(statements.append)
+    emps = hr.hire_many([
+        {"name": f"E{i}", "email": f"e{i}@test.com", "department": f"D{i % 3}",
+         "title": "Dev", "salary": 50_000}
+        for i in range(250)
+    ])
+    assert sum(s.startswith("INSERT INTO employees") for s in statements) == 3
+    assert len(hr.list_employees()) == 250
+    statements.clear()
+    entries = hr.log_time_many([{"employee_id": e.id, "hours": 1, "project": "P"} for e in emps])
+    assert sum(s.startswith("INSERT INTO time_entries") for s in statements) == 2
+    hr.conn.set_trace_callback(None)
+    assert len(entries) == 250
+    assert hr.headcount_by_department() == {"D0": 84, "D1": 83, "D2": 83}
+
+def test_failed_write_rolls_back(hr):
+    hr.hire("Vic", "vic@test.com", "Eng", "Dev", 100_000)
+    with pytest.raises(sqlite3.IntegrityError, match="employees.email"):
+        hr.hire_many([
+            {"name": "W", "email": "w@test.com", "department": "New", "title": "Dev", "salary": 1},
+            {"name": "Dup", "email": "vic@test.com", "department": "New", "title": "Dev", "salary": 1},
+        ])
+    assert hr.get_employee_by_email("w@test.com") is None
+    assert hr.get_department("New") is None
+    assert not hr.db.conn.in_transaction
+
+def test_list_employees_raw(hr):
+    e = hr.hire("Xena", "xena@test.com", "Eng", "Dev", 100_000)
+    hr.hire("Yuri", "yuri@test.com", "Ops", "SRE", 100_000)
+    rows = hr.list_employees_raw(department="Eng", status=EmployeeStatus.ACTIVE)
+    assert len(rows) == 1
+    assert type(rows[0]) is tuple
+    assert rows[0][:3] == (e.id, "Xena", "xena@test.com")
+    assert not hasattr(e, "__dict__")
+
+def test_iter_variants_stream(hr):
+    e = hr.hire("Zoe", "zoe@test.com", "Eng", "Dev", 100_000)
+    hr.log_time(e.id, 2, "P", entry_date="2025-05-01")
+    hr.request_pto(e.id, PTOType.SICK, "2025-05-02", "2025-05-02")
+    it = hr.iter_employees(department="Eng")
+    assert next(it).id == e.id
+    assert next(it, None) is None
+    assert [t.hours for t in hr.iter_time_entries(e.id)] == [2]
+    assert [p.type for p in hr.iter_pto_requests(employee_id=e.id)] == [PTOType.SICK]
+
+def test_bulk_rows_share_one_timestamp(hr):
+    emps = hr.hire_many([
+        {"name": f"T{i}", "email": f"t{i}@test.com", "department": "Eng", "title": "Dev", "salary": 1}
+        for i in range(3)
+    ])
+    assert len({e.created_at for e in emps}) == 1
+    assert hr.get_department("Eng").created_at == emps[0].created_at
+
+def test_unknown_employee_rejected(hr):
+    with pytest.raises(ValueError, match="not found"):
+        hr.log_time(b"\x00" * 16, 8, "P")
+    with pytest.raises(ValueError, match="not found"):
+        hr.request_pto(b"\x00" * 16, PTOType.SICK, "2025-01-01", "2025-01-01")
+
+def test_list_employees_minimal(hr):
+    e = hr.hire("Abe", "abe@test.com", "Eng", "Dev", 100_000)
+    hr.hire("Bea", "bea@test.com", "Ops", "SRE", 100_000)
+    t = hr.hire("Cal", "cal@test.com", "Eng", "Dev", 100_000)
+    hr.terminate(t.id)
+    assert hr.list_employees_minimal("Eng") == [(e.id, "Abe", "Dev")]
+    assert hr.list_employees_minimal("Eng", EmployeeStatus.TERMINATED) == [(t.id, "Cal", "Dev")]
+
+def test_new_database_is_stamped(hr):
+    assert hr.conn.execute("PRAGMA user_version").fetchone()[0] == 1
+
+def test_legacy_database_is_migrated(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    mgr, rep, gone, pto = (str(uuid.uuid4()) for _ in range(4))
+    legacy = sqlite3.connect(path)
+    legacy.executescript(LEGACY_SCHEMA)
+    legacy.execute("INSERT INTO departments VALUES (?, 'Eng', NULL, 0, '2020-01-01')", (str(uuid.uuid4()),))
+    legacy.executemany(
+        "INSERT INTO employees VALUES (?,?,?,'Eng','Dev',?,120000,'2020-01-01',?,'','2020-01-01')",
+        [(mgr, "Mgr", "mgr@test.com", None, "active"),
+         (rep, "Rep", "rep@test.com", mgr, "onleave"),
+         (gone, "Gone", "gone@test.com", None, "terminated")],
+    )
+    legacy.execute("INSERT INTO time_entries VALUES (?,?,'2024-01-02',8,'P','','2024-01-02')",
+                   (str(uuid.uuid4()), mgr))
+    legacy.execute("INSERT INTO pto_requests VALUES (?,?,'vacation','2024-02-01','2024-02-02',"
+                   "'approved','',?,'2024-01-05')", (pto, rep, mgr))
+    legacy.commit()
+    legacy.close()
+
+    h = HRSystem(path)
+    try:
+        assert h.conn.execute("PRAGMA user_version").fetchone()[0] == 1
+        assert h.payroll_summary()["total_headcount"] == 1
+        assert h.headcount_by_department() == {"Eng": 1}
+        statuses = {e.name: e.status for e in h.list_employees()}
+        assert statuses == {"Mgr": EmployeeStatus.ACTIVE, "Rep": EmployeeStatus.ON_LEAVE,
+                            "Gone": EmployeeStatus.TERMINATED}
+        mgr_id = uuid.UUID(mgr).bytes
+        assert h.get_employee_by_email("rep@test.com").manager_id == mgr_id
+        assert h.hours_by_project(mgr_id) == {"P": 8}
+        req = h.get_pto_request(uuid.UUID(pto).bytes)
+        assert (req.type, req.status, req.approved_by) == (PTOType.VACATION, PTOStatus.APPROVED, mgr_id)
+        assert h.get_department("Eng") is not None
+        assert h.conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    finally:
+        h.close()
+
+def test_legacy_migration_rejects_orphans(tmp_path):
+    path = str(tmp_path / "orphans.db")
+    entry = str(uuid.uuid4())
+    legacy = sqlite3.connect(path)
+    legacy.executescript(LEGACY_SCHEMA)
+    legacy.execute("INSERT INTO time_entries VALUES (?,?,'2024-01-02',8,'P','','2024-01-02')",
+                   (entry, str(uuid.uuid4())))
+    legacy.commit()
+    legacy.close()
+    with pytest.raises(RuntimeError, match=f"time_entries {uuid.UUID(entry).hex} -> missing employees"):
+        HRSystem(path)
+    # The failed upgrade rolled back, leaving the legacy tables untouched
+    check = sqlite3.connect(path)
+    assert check.execute("PRAGMA user_version").fetchone()[0] == 0
+    assert check.execute("SELECT id FROM time_entries").fetchall() == [(entry,)]
+    check.close()
+
+def test_legacy_migration_rejects_unknown_enum_values(tmp_path):
+    path = str(tmp_path / "retired.db")
+    legacy = sqlite3.connect(path)
+    legacy.executescript(LEGACY_SCHEMA)
+    legacy.execute("INSERT INTO employees VALUES (?,'Old','old@test.com','Eng','Dev',NULL,1,"
+                   "'2001-01-01','retired','','2001-01-01')", (str(uuid.uuid4()),))
+    legacy.commit()
+    legacy.close()
+    with pytest.raises(RuntimeError, match="employees.status holds 'retired'"):
+        HRSystem(path)
+    check = sqlite3.connect(path)
+    assert check.execute("SELECT status FROM employees").fetchall() == [("retired",)]
+    check.close()
+
+def test_newer_schema_version_rejected(tmp_path):
+    path = str(tmp_path / "future.db")
+    future = sqlite3.connect(path)
+    future.execute("PRAGMA user_version = 99")
+    future.close()
+    with pytest.raises(RuntimeError, match="schema version 99"):
+        HRSystem(path)
+
+def test_non_bytes_employee_id_raises_value_error(hr):
+    with pytest.raises(ValueError, match="'missing' not found"):
+        hr.log_time("missing", 8, "P")
+    with pytest.raises(ValueError, match="None not found"):
+        hr.request_pto(None, PTOType.SICK, "2025-01-01", "2025-01-01")
+    with pytest.raises(ValueError, match="'missing' not found"):
+        hr.request_pto_many([{"employee_id": "missing", "pto_type": PTOType.SICK,
+                              "start_date": "2025-01-01", "end_date": "2025-01-01"}])
+
+def test_failed_commit_rolls_back(hr):
+    with pytest.raises(sqlite3.IntegrityError):
+        with hr.db.write() as c:
+            c.execute("PRAGMA defer_foreign_keys = ON")
+            c.execute(
+                "INSERT INTO time_entries (id, employee_id, date, hours, project, created_at) "
+                "VALUES (?, ?, '2025-01-01', 1, 'P', '2025-01-01')",
+                (uuid.uuid4().bytes, b"no-such-employee"),
+            )
+    assert not hr.db.conn.in_transaction
+    e = hr.hire("After", "after@test.com", "Eng", "Dev", 100_000)
+    assert hr.get_time_entries(e.id) == []
+    assert hr.conn.execute("SELECT COUNT(*) FROM time_entries").fetchone()[0] == 0
+
+def test_half_consumed_iterators_release_readers(tmp_path, monkeypatch):
+    import hr_system
+    monkeypatch.setattr(hr_system, "_ITER_BATCH_SIZE", 2)
+    h = HRSystem(str(tmp_path / "iter.db"), pool_size=1, read_timeout=1)
+    try:
+        emps = h.hire_many([
+            {"name": f"I{i}", "email": f"i{i}@test.com", "department": "Eng",
+             "title": "Dev", "salary": 1}
+            for i in range(5)
+        ])
+        iterators = [h.iter_employees() for _ in range(4)]
+        for it in iterators:
+            next(it)
+        assert h.get_employee(emps[0].id) is not None
+        assert [e.id for e in iterators[0]] == [e.id for e in emps[1:]]
+    finally:
+        h.close()
+
+def test_iter_pages_keep_order(hr, monkeypatch):
+    import hr_system
+    monkeypatch.setattr(hr_system, "_ITER_BATCH_SIZE", 2)
+    e = hr.hire("Pager", "pager@test.com", "Eng", "Dev", 100_000)
+    dates = ["2025-01-03", "2025-01-01", "2025-01-03", "2025-01-02", "2025-01-03"]
+    hr.log_time_many([{"employee_id": e.id, "hours": 1, "project": "P", "entry_date": d}
+                      for d in dates])
+    entries = list(hr.iter_time_entries(e.id))
+    assert [t.date for t in entries] == sorted(dates, reverse=True)
+    assert [t.id for t in entries] == [t.id for t in hr.get_time_entries(e.id)]
+    assert len({t.id for t in entries}) == 5
+    reqs = hr.request_pto_many([
+        {"employee_id": e.id, "pto_type": PTOType.SICK,
+         "start_date": f"2025-02-0{i}", "end_date": f"2025-02-0{i}"}
+        for i in range(1, 6)
+    ])
+    assert [r.id for r in hr.iter_pto_requests(status=PTOStatus.PENDING)] == [r.id for r in reqs]
+    hr.hire_many([{"name": f"P{i}", "email": f"p{i}@test.com", "department": d,
+                   "title": "Dev", "salary": 1} for i, d in enumerate("BABAB")])
+    for dept in (None, "A"):
+        paged = {x.id for x in hr.iter_employees(dept, EmployeeStatus.ACTIVE)}
+        assert paged == {x.id for x in hr.list_employees(dept, EmployeeStatus.ACTIVE)}
+
+def test_read_checkout_times_out(tmp_path):
+    h = HRSystem(str(tmp_path / "busy.db"), pool_size=1, read_timeout=0.05)
+    try:
+        with h.db.read():
+            with pytest.raises(TimeoutError, match="pooled readers are checked out"):
+                h.get_employee(b"missing")
+    finally:
+        h.close()
+
+def test_tenure_report_uses_hire_date_index(hr):
+    from hr_system import _TENURE_SQL
+    plan = [r[3] for r in hr.conn.execute("EXPLAIN QUERY PLAN " + _TENURE_SQL)]
+    assert plan == ["SCAN employees USING INDEX idx_emp_hire"]
+
+def test_list_pto_requests_ordered_by_created_at(hr):
+    e = hr.hire("Ord", "ord@test.com", "HR", "Staff", 60_000)
+    reqs = [hr.request_pto(e.id, PTOType.PERSONAL, f"2025-03-0{i}", f"2025-03-0{i}")
+            for i in range(1, 4)]
+    # Make creation order disagree with insertion (rowid) order
+    stamps = ["2025-01-03T00:00:00", "2025-01-01T00:00:00", "2025-01-02T00:00:00"]
+    with hr.db.write() as c:
+        for req, stamp in zip(reqs, stamps):
+            c.execute("UPDATE pto_requests SET created_at = ? WHERE id = ?", (stamp, req.id))
+    expected = [reqs[1].id, reqs[2].id, reqs[0].id]
+    assert [r.id for r in hr.list_pto_requests(employee_id=e.id)] == expected
+    assert [r.id for r in hr.list_pto_requests(status=PTOStatus.PENDING)] == expected
+
+def test_pending_pto_query_uses_partial_index():
+    h = HRSystem(":memory:")  # reads run on the writer, so the trace sees them
+    statements = []
+    h.conn.set_trace_callback(statements.append)
+    h.list_pto_requests(status=PTOStatus.PENDING)
+    h.conn.set_trace_callback(None)
+    (query,) = [s for s in statements if "FROM pto_requests" in s]
+    plan = [r[3] for r in h.conn.execute("EXPLAIN QUERY PLAN " + query)]
+    assert plan == ["SCAN pto_requests USING INDEX idx_pto_pending"]
+    h.close()
+
+def test_filtered_listings_do_not_resort(monkeypatch):
+    import hr_system
+    monkeypatch.setattr(hr_system, "_ITER_BATCH_SIZE", 2)
+    h = HRSystem(":memory:")
+    h.hire_many([{"name": f"S{i}", "email": f"s{i}@test.com", "department": "Eng",
+                  "title": "Dev", "salary": 1} for i in range(5)])
+    e = h.list_employees()[0]
+    h.log_time_many([{"employee_id": e.id, "hours": 1, "project": "P",
+                      "entry_date": f"2025-01-0{i}"} for i in range(1, 6)])
+    statements = []
+    h.conn.set_trace_callback(statements.append)
+    assert len(h.list_employees(status=EmployeeStatus.ACTIVE)) == 5
+    assert len(statements) == 1
+    for args in [(None, None), ("Eng", None), (None, EmployeeStatus.ACTIVE),
+                 ("Eng", EmployeeStatus.ACTIVE)]:
+        assert len(list(h.iter_employees(*args))) == 5
+    assert len(list(h.iter_time_entries(e.id))) == 5
+    h.conn.set_trace_callback(None)
+    pages = [s for s in statements[1:] if " LIMIT " in s]
+    assert len(pages) == 5 * 3  # two full batches and a short one each
+    for query in pages:
+        plan = " ".join(r[3] for r in h.conn.execute("EXPLAIN QUERY PLAN " + query))
+        assert "TEMP B-TREE" not in plan, query
+    h.close()
+
+def test_created_at_is_naive_utc_iso(hr):
+    import warnings
+    from datetime import datetime, timezone
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        e = hr.hire("Clock", "clock@test.com", "Eng", "Dev", 100_000)
+    stamp = datetime.fromisoformat(e.created_at)
+    assert stamp.tzinfo is None
+    utc_now = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert abs((utc_now - stamp).total_seconds()) < 60